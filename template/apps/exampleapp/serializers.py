@@ -1,9 +1,9 @@
-from rest_framework import serializers
+from core.serializers.base import BaseModelSerializer
 
 from .models import ExampleModel
 
 
-class ExampleModelSerializer(serializers.ModelSerializer):
+class ExampleModelSerializer(BaseModelSerializer):
     class Meta:
         model = ExampleModel
         fields = "__all__"
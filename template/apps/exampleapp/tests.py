@@ -1,3 +1,299 @@
+import base64
+import json
+from datetime import timedelta
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth.models import User
+from django.core.management import CommandError, call_command
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory, APITestCase, force_authenticate
+
+from core.utils.archive import archive_soft_deleted
+from core.views.base import encode_sync_token
+
+from .models import ExampleModel
+from .views import ExampleModelViewSet
+
+
+class ArchiveSoftDeletedTests(TestCase):
+    def setUp(self):
+        self.created_at = timezone.now() - timedelta(days=90)
+        self.expired = self.create_deleted("expired", deleted_days_ago=40)
+        self.recent = self.create_deleted("recent", deleted_days_ago=1)
+
+    def create_deleted(self, name, deleted_days_ago):
+        obj = ExampleModel.objects.create(name=name, description="d")
+        obj.delete()
+        ExampleModel.objects.all_with_deleted().filter(pk=obj.pk).update(
+            created_at=self.created_at,
+            deleted_at=timezone.now() - timedelta(days=deleted_days_ago),
+        )
+        return obj
+
+    def test_dry_run_counts_expired_rows(self):
+        self.assertEqual(archive_soft_deleted(ExampleModel, dry_run=True), 1)
+        self.assertEqual(ExampleModel.objects.all_with_deleted().count(), 2)
+
+    def test_archive_moves_expired_rows(self):
+        self.assertEqual(archive_soft_deleted(ExampleModel, sleep=0), 1)
+
+        remaining = ExampleModel.objects.all_with_deleted()
+        self.assertEqual(list(remaining), [self.recent])
+        self.assertEqual(
+            list(ExampleModel.objects.archived().values_list("object_id", flat=True)),
+            [str(self.expired.pk)],
+        )
+
+    def test_purge_does_not_archive(self):
+        self.assertEqual(archive_soft_deleted(ExampleModel, sleep=0, purge=True), 1)
+
+        self.assertEqual(ExampleModel.objects.all_with_deleted().count(), 1)
+        self.assertFalse(ExampleModel.objects.archived().exists())
+
+    def test_restore_round_trip(self):
+        archive_soft_deleted(ExampleModel, sleep=0)
+
+        restored = ExampleModel.objects.archived().get().restore()
+
+        self.assertEqual(restored.pk, self.expired.pk)
+        self.assertFalse(restored.is_deleted)
+
+        restored = ExampleModel.objects.get(pk=self.expired.pk)
+        self.assertEqual(restored.name, "expired")
+        self.assertFalse(restored.is_deleted)
+        self.assertIsNone(restored.deleted_at)
+        self.assertEqual(restored.created_at, self.created_at)
+        self.assertFalse(ExampleModel.objects.archived().exists())
+
+    def test_referenced_rows_are_skipped(self):
+        with mock.patch(
+            "core.utils.archive.get_referenced_pks",
+            return_value={self.expired.pk},
+        ):
+            self.assertEqual(archive_soft_deleted(ExampleModel, dry_run=True), 0)
+            self.assertEqual(archive_soft_deleted(ExampleModel, sleep=0), 0)
+
+        self.assertEqual(ExampleModel.objects.all_with_deleted().count(), 2)
+        self.assertFalse(ExampleModel.objects.archived().exists())
+
+    def test_archival_disabled(self):
+        with mock.patch.object(ExampleModel, "archive_mode", None):
+            with self.assertRaises(ValueError):
+                archive_soft_deleted(ExampleModel)
+            with self.assertRaises(CommandError):
+                call_command(
+                    "archive_soft_deleted", "--model", "exampleapp.ExampleModel"
+                )
+
+        self.assertEqual(ExampleModel.objects.all_with_deleted().count(), 2)
+
+    def test_command(self):
+        out = StringIO()
+
+        call_command("archive_soft_deleted", "--sleep", "0", stdout=out)
+
+        self.assertIn("Archived 1 rows of exampleapp.ExampleModel", out.getvalue())
+        self.assertEqual(ExampleModel.objects.archived().count(), 1)
+
+
+class ChangesTests(APITestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(username="sync")
+        self.client.force_authenticate(self.user)
+        self.url = reverse("examplemodel-changes")
+        self.objs = [
+            ExampleModel.objects.create(name=f"n{i}", description="d") for i in range(5)
+        ]
+
+    def get_changes(self, **params):
+        return self.client.get(self.url, params)
+
+    def raw_token(self, *values):
+        return base64.urlsafe_b64encode(json.dumps(values).encode()).decode()
+
+    def test_pages_in_modified_order(self):
+        first = self.get_changes(limit=3)
+        second = self.get_changes(since=first.data["sync_token"], limit=3)
+
+        self.assertEqual(first.status_code, 200)
+        self.assertTrue(first.data["has_more"])
+        self.assertFalse(second.data["has_more"])
+        expected = ExampleModel.objects.order_by("modified_at", "pk").values_list(
+            "pk", flat=True
+        )
+        self.assertEqual(
+            [row["id"] for row in first.data["results"] + second.data["results"]],
+            [str(pk) for pk in expected],
+        )
+
+    def test_no_changes(self):
+        token = self.get_changes().data["sync_token"]
+
+        response = self.get_changes(since=token)
+
+        self.assertEqual(response.data["results"], [])
+        self.assertFalse(response.data["has_more"])
+        self.assertTrue(response.data["sync_token"])
+
+    def test_updates_and_tombstones(self):
+        token = self.get_changes().data["sync_token"]
+        self.objs[0].delete()
+        self.objs[1].name = "renamed"
+        self.objs[1].save()
+
+        results = self.get_changes(since=token).data["results"]
+
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            set(results[0]), {"id", "is_deleted", "deleted_at", "modified_at"}
+        )
+        self.assertEqual(results[0]["id"], str(self.objs[0].pk))
+        self.assertTrue(results[0]["is_deleted"])
+        self.assertEqual(results[1]["name"], "renamed")
+
+    def test_idle_collection_keeps_syncing(self):
+        ExampleModel.objects.update(modified_at=timezone.now() - timedelta(days=60))
+
+        first = self.get_changes()
+        second = self.get_changes(since=first.data["sync_token"])
+        third = self.get_changes(since=second.data["sync_token"])
+
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(third.status_code, 200)
+
+    def test_paging_through_old_rows(self):
+        ExampleModel.objects.update(modified_at=timezone.now() - timedelta(days=60))
+
+        response = self.get_changes(limit=2)
+        while response.data["has_more"]:
+            response = self.get_changes(since=response.data["sync_token"], limit=2)
+            self.assertEqual(response.status_code, 200)
+
+    def test_token_synced_before_retention_window_expires(self):
+        token = encode_sync_token(timezone.now() - timedelta(days=60))
+
+        response = self.get_changes(since=token)
+
+        self.assertEqual(response.status_code, 410)
+        self.assertEqual(response.data["error"]["code"], "sync_token_expired")
+
+    def test_paging_keeps_sync_point(self):
+        ExampleModel.objects.update(modified_at=timezone.now() - timedelta(days=20))
+        token = encode_sync_token(timezone.now() - timedelta(days=25))
+        first = self.get_changes(since=token, limit=2)
+        last = self.get_changes(since=token)
+
+        with mock.patch(
+            "core.views.base.timezone.now",
+            return_value=timezone.now() + timedelta(days=15),
+        ):
+            # Unsynced tombstones may have been archived since the old sync point
+            paged = self.get_changes(since=first.data["sync_token"])
+            caught_up = self.get_changes(since=last.data["sync_token"])
+
+        self.assertTrue(first.data["has_more"])
+        self.assertEqual(paged.status_code, 410)
+        self.assertFalse(last.data["has_more"])
+        self.assertEqual(caught_up.status_code, 200)
+
+    def test_invalid_tokens(self):
+        now = timezone.now()
+        tokens = [
+            "garbage",
+            self.raw_token(now.isoformat(), now.isoformat(), "zzz"),
+            self.raw_token(now.isoformat(), now.isoformat(), None),
+            self.raw_token(now.replace(tzinfo=None).isoformat(), None, None),
+        ]
+
+        for token in tokens:
+            with self.subTest(token=token):
+                response = self.get_changes(since=token)
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["error"]["code"], "validation_error")
+                self.assertIn("since", response.data["error"]["details"])
+
+    def test_uses_viewset_scoping(self):
+        class ScopedViewSet(ExampleModelViewSet):
+            def get_queryset(self):
+                return super().get_queryset().filter(name="n0")
+
+        self.objs[0].delete()
+        self.objs[1].delete()
+        request = APIRequestFactory().get("/")
+        force_authenticate(request, user=self.user)
+
+        response = ScopedViewSet.as_view({"get": "changes"})(request)
+
+        # Tombstones are kept, but only for rows within the subclass's scope
+        self.assertEqual(
+            [(row["id"], row["is_deleted"]) for row in response.data["results"]],
+            [(str(self.objs[0].pk), True)],
+        )
+
+
+class SparseFieldsetTests(APITestCase):
+    def setUp(self):
+        self.client.force_authenticate(User.objects.create_user(username="sparse"))
+        self.obj = ExampleModel.objects.create(name="a", description="d" * 1000)
+        self.columns = {f.attname for f in ExampleModel._meta.concrete_fields}
+
+    def get_queryset(self, viewset_class=ExampleModelViewSet, **params):
+        request = Request(APIRequestFactory().get("/", params))
+        view = viewset_class(action="list", request=request, format_kwarg=None)
+        return view.filter_queryset(view.get_queryset())
+
+    def test_fields_pushed_down_to_query(self):
+        obj = self.get_queryset(fields="name").get()
+
+        self.assertEqual(obj.get_deferred_fields(), self.columns - {"id", "name"})
+
+    def test_omit_pushed_down_to_query(self):
+        obj = self.get_queryset(omit="description").get()
+
+        self.assertEqual(obj.get_deferred_fields(), {"description"})
+
+    def test_no_params_loads_every_column(self):
+        obj = self.get_queryset().get()
+
+        self.assertEqual(obj.get_deferred_fields(), set())
+
+    def test_list_response_is_trimmed(self):
+        response = self.client.get(reverse("examplemodel-list"), {"fields": "name"})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.data["results"], [{"id": str(self.obj.pk), "name": "a"}]
+        )
+
+    def test_changes_keeps_id(self):
+        response = self.client.get(reverse("examplemodel-changes"), {"fields": "name"})
+
+        self.assertEqual(
+            response.data["results"], [{"id": str(self.obj.pk), "name": "a"}]
+        )
+
+    def test_unknown_fields(self):
+        for param in ("fields", "omit"):
+            with self.subTest(param=param):
+                response = self.client.get(
+                    reverse("examplemodel-list"), {param: "name,bogus"}
+                )
+                self.assertEqual(response.status_code, 400)
+                self.assertEqual(response.data["error"]["code"], "validation_error")
+                self.assertIn(param, response.data["error"]["details"])
+
+    def test_declared_field_sets(self):
+        class DeclaredViewSet(ExampleModelViewSet):
+            sparse_fields = ["id", "name", "description"]
+            default_sparse_fields = ["id", "name"]
+
+        obj = self.get_queryset(DeclaredViewSet).get()
 
-# Create your tests here.
+        self.assertEqual(obj.get_deferred_fields(), self.columns - {"id", "name"})
+        with self.assertRaises(ValidationError):
+            self.get_queryset(DeclaredViewSet, fields="is_active")
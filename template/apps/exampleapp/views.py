@@ -1,4 +1,4 @@
-from rest_framework.viewsets import ModelViewSet
+from core.views.base import BaseModelViewSet
 
 from .models import ExampleModel
 from .serializers import ExampleModelSerializer
@@ -6,6 +6,6 @@ from .serializers import ExampleModelSerializer
 # Create your views here.
 
 
-class ExampleModelViewSet(ModelViewSet):
+class ExampleModelViewSet(BaseModelViewSet):
     queryset = ExampleModel.objects.all()
     serializer_class = ExampleModelSerializer
@@ -1,9 +1,18 @@
 """Custom exception handlers for better API error responses"""
 
+from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 from rest_framework.views import exception_handler
 
 
+class SyncTokenExpired(APIException):
+    """Sync token predates the soft-delete retention window; do a full refresh"""
+
+    status_code = 410
+    default_detail = "Sync token has expired, a full refresh is required"
+    default_code = "sync_token_expired"
+
+
 def custom_exception_handler(exc, context):
     """
     Custom exception handler that transforms DRF errors into a consistent format.
@@ -81,6 +90,7 @@ def get_error_code(exc):
         "UnsupportedMediaType": "unsupported_media_type",
         "Throttled": "throttled",
         "ParseError": "parse_error",
+        "SyncTokenExpired": "sync_token_expired",
     }
 
     return error_code_mapping.get(exception_name, "error")
@@ -103,6 +113,7 @@ def get_error_message(exc):
         "UnsupportedMediaType": "Unsupported media type",
         "Throttled": "Request was throttled",
         "ParseError": "Malformed request",
+        "SyncTokenExpired": "Sync token has expired, a full refresh is required",
     }
 
     return default_messages.get(exception_name, "An error occurred")
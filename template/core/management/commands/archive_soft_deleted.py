@@ -0,0 +1,74 @@
+from django.apps import apps
+from django.core.management.base import BaseCommand, CommandError
+
+from core.models.base import SoftDeleteModel
+from core.utils.archive import archive_soft_deleted, get_archivable_models
+
+
+class Command(BaseCommand):
+    help = "Archive or purge soft-deleted rows older than their retention window"
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--model",
+            action="append",
+            dest="models",
+            help="Model to process as app_label.ModelName (repeatable, default: all)",
+        )
+        parser.add_argument(
+            "--retention-days",
+            type=int,
+            help="Override the retention window of every processed model",
+        )
+        parser.add_argument("--batch-size", type=int, help="Rows per batch")
+        parser.add_argument(
+            "--sleep", type=float, help="Seconds to pause between batches"
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            default=None,
+            help="Delete rows instead of moving them to the archive",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Only report how many rows would be processed",
+        )
+
+    def handle(self, *args, **options):
+        if options["models"]:
+            models = []
+            for label in options["models"]:
+                try:
+                    model = apps.get_model(label)
+                except (LookupError, ValueError) as e:
+                    raise CommandError(str(e))
+                if not issubclass(model, SoftDeleteModel):
+                    raise CommandError(f"{label} is not a SoftDeleteModel")
+                if not model.archive_mode:
+                    raise CommandError(f"Archival is disabled for {label}")
+                models.append(model)
+        else:
+            models = get_archivable_models()
+
+        for model in models:
+            count = archive_soft_deleted(
+                model,
+                retention_days=options["retention_days"],
+                batch_size=options["batch_size"],
+                sleep=options["sleep"],
+                purge=options["purge"],
+                dry_run=options["dry_run"],
+            )
+
+            if options["dry_run"]:
+                action = "Would process"
+            elif options["purge"] or model.archive_mode == "purge":
+                action = "Purged"
+            else:
+                action = "Archived"
+
+            self.stdout.write(
+                self.style.SUCCESS(f"{action} {count} rows of {model._meta.label}")
+            )
@@ -0,0 +1,54 @@
+import uuid
+
+from django.db import migrations, models
+
+import core.models.archive
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = []
+
+    operations = [
+        migrations.CreateModel(
+            name="ArchivedRecord",
+            fields=[
+                (
+                    "id",
+                    models.UUIDField(
+                        default=uuid.uuid4,
+                        editable=False,
+                        primary_key=True,
+                        serialize=False,
+                    ),
+                ),
+                ("model_label", models.CharField(max_length=100)),
+                ("object_id", models.CharField(max_length=64)),
+                (
+                    "tenant_id",
+                    models.UUIDField(blank=True, db_index=True, null=True),
+                ),
+                (
+                    "data",
+                    models.JSONField(encoder=core.models.archive.ArchiveJSONEncoder),
+                ),
+                ("deleted_at", models.DateTimeField(blank=True, null=True)),
+                ("deleted_by", models.UUIDField(blank=True, null=True)),
+                (
+                    "archived_at",
+                    models.DateTimeField(auto_now_add=True, db_index=True),
+                ),
+            ],
+            options={
+                "ordering": ["-archived_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["model_label", "object_id"],
+                        name="core_archive_model_object_idx",
+                    )
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,3 @@
+from .archive import ArchivedRecord
+
+__all__ = ["ArchivedRecord"]
@@ -0,0 +1,69 @@
+import datetime
+
+from django.core import serializers
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models, transaction
+
+from core.models.base import UUIDModel
+
+
+class ArchiveJSONEncoder(DjangoJSONEncoder):
+    """DjangoJSONEncoder that keeps microseconds so restored rows are exact"""
+
+    def default(self, o):
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+class ArchivedRecord(UUIDModel):
+    """Soft-deleted row moved out of its hot table by the archival job"""
+
+    model_label = models.CharField(max_length=100)  # e.g. "exampleapp.examplemodel"
+    object_id = models.CharField(max_length=64)
+    tenant_id = models.UUIDField(null=True, blank=True, db_index=True)
+    data = models.JSONField(encoder=ArchiveJSONEncoder)  # Serialized field values
+    deleted_at = models.DateTimeField(null=True, blank=True)
+    deleted_by = models.UUIDField(null=True, blank=True)
+    archived_at = models.DateTimeField(auto_now_add=True, db_index=True)
+
+    class Meta:
+        ordering = ["-archived_at"]
+        indexes = [
+            models.Index(
+                fields=["model_label", "object_id"],
+                name="core_archive_model_object_idx",
+            ),
+        ]
+
+    def restore(self):
+        """
+        Put the archived row back into its table and un-delete it.
+
+        Returns:
+            The restored model instance
+        """
+        deserialized = next(
+            serializers.deserialize(
+                "python",
+                [
+                    {
+                        "model": self.model_label,
+                        "pk": self.object_id,
+                        "fields": self.data,
+                    }
+                ],
+            )
+        )
+        obj = deserialized.object
+
+        with transaction.atomic():
+            # Raw save re-inserts the stored values (keeps created_at) and m2m
+            deserialized.save()
+            obj.restore()
+            self.delete()
+
+        return obj
+
+    def __str__(self) -> str:
+        return f"{self.model_label} {self.object_id}"
@@ -40,6 +40,10 @@ class SoftDeleteModel(models.Model):
         null=True, blank=True
     )  # Store user UUID from  request context
 
+    # Archival of old soft-deleted rows (see core.utils.archive)
+    archive_mode = "archive"  # "archive", "purge" or None to keep rows forever
+    archive_retention_days = None  # None uses SOFT_DELETE_RETENTION_DAYS
+
     class Meta:
         abstract = True
 
@@ -152,6 +156,15 @@ class SoftDeleteManager(models.Manager):
     def deleted_only(self):
         return super().get_queryset().filter(is_deleted=True)
 
+    def archived(self):
+        from core.models.archive import ArchivedRecord
+
+        qs = ArchivedRecord.objects.filter(model_label=self.model._meta.label_lower)
+        tenant_id = get_current_tenant_id()
+        if tenant_id and any(f.name == "tenant_id" for f in self.model._meta.fields):
+            qs = qs.filter(tenant_id=tenant_id)
+        return qs
+
     def active_only(self):
         return self.get_queryset().filter(is_active=True)
 
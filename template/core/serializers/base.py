@@ -0,0 +1,18 @@
+from rest_framework import serializers
+
+
+class BaseModelSerializer(serializers.ModelSerializer):
+    """
+    ModelSerializer for BaseModel subclasses.
+
+    Accepts an optional `fields` argument that limits the serializer to a
+    subset of its fields (used by sparse fieldsets in BaseModelViewSet).
+    """
+
+    def __init__(self, *args, **kwargs):
+        fields = kwargs.pop("fields", None)
+        super().__init__(*args, **kwargs)
+
+        if fields is not None:
+            for field_name in set(self.fields) - set(fields):
+                self.fields.pop(field_name)
@@ -0,0 +1,156 @@
+import logging
+import time
+from datetime import timedelta
+
+from django.apps import apps
+from django.conf import settings
+from django.core import serializers
+from django.db import transaction
+from django.utils import timezone
+
+from core.models.archive import ArchivedRecord
+from core.models.base import SoftDeleteModel
+
+logger = logging.getLogger(__name__)
+
+
+def get_archivable_models():
+    """Return every concrete SoftDeleteModel that has archival enabled."""
+    return [
+        model
+        for model in apps.get_models()
+        if issubclass(model, SoftDeleteModel) and model.archive_mode
+    ]
+
+
+def get_referenced_pks(model, pks):
+    """Return the pks among pks that other rows still point to."""
+    referenced = set()
+    for relation in model._meta.related_objects:
+        lookup = f"{relation.field.name}__pk"
+        referenced.update(
+            relation.related_model._base_manager.filter(
+                **{f"{lookup}__in": pks}
+            ).values_list(lookup, flat=True)
+        )
+    return referenced
+
+
+def archive_soft_deleted(
+    model,
+    retention_days=None,
+    batch_size=None,
+    sleep=None,
+    purge=None,
+    dry_run=False,
+):
+    """
+    Move soft-deleted rows past their retention window out of the model's table.
+
+    Rows are handled in small primary-key-ordered batches, each in its own
+    transaction, with a pause between batches so the table is never locked for
+    long and WAL is written at a steady rate. Archived rows can be brought back
+    with ArchivedRecord.restore().
+
+    Rows that other rows still reference (through a foreign key or a reverse
+    many-to-many) are skipped, so nothing is cascade-deleted without being
+    archived; they are picked up once their dependents are gone.
+
+    Args:
+        model: SoftDeleteModel subclass to process
+        retention_days: Days a row stays soft-deleted before it is moved
+            (default: model.archive_retention_days or SOFT_DELETE_RETENTION_DAYS)
+        batch_size: Rows per batch (default: SOFT_DELETE_ARCHIVE_BATCH_SIZE)
+        sleep: Seconds to pause between batches (default: SOFT_DELETE_ARCHIVE_SLEEP)
+        purge: Delete rows without archiving them (default: model.archive_mode)
+        dry_run: Only count the rows that would be processed
+
+    Returns:
+        int: Number of rows archived or purged
+
+    Raises:
+        ValueError: If archival is disabled for the model (archive_mode = None)
+    """
+    if not model.archive_mode:
+        raise ValueError(f"Archival is disabled for {model._meta.label}")
+
+    if retention_days is None:
+        retention_days = model.archive_retention_days
+    if retention_days is None:
+        retention_days = getattr(settings, "SOFT_DELETE_RETENTION_DAYS", 30)
+    if batch_size is None:
+        batch_size = getattr(settings, "SOFT_DELETE_ARCHIVE_BATCH_SIZE", 500)
+    if sleep is None:
+        sleep = getattr(settings, "SOFT_DELETE_ARCHIVE_SLEEP", 0.1)
+    if purge is None:
+        purge = model.archive_mode == "purge"
+
+    cutoff = timezone.now() - timedelta(days=retention_days)
+
+    # _base_manager bypasses soft-delete and tenant filtering
+    expired = model._base_manager.filter(
+        is_deleted=True, deleted_at__lt=cutoff
+    ).order_by("pk")
+
+    if dry_run:
+        # Referenced rows are skipped by a real run, so leave them out here too
+        pks = list(expired.values_list("pk", flat=True))
+        count = 0
+        for start in range(0, len(pks), batch_size):
+            batch = pks[start : start + batch_size]
+            count += len(batch) - len(get_referenced_pks(model, batch))
+        return count
+
+    label = model._meta.label_lower
+    processed = 0
+    last_pk = None
+
+    while True:
+        batch_qs = expired if last_pk is None else expired.filter(pk__gt=last_pk)
+
+        with transaction.atomic():
+            rows = list(batch_qs.select_for_update(skip_locked=True)[:batch_size])
+            if not rows:
+                break
+
+            referenced = get_referenced_pks(model, [row.pk for row in rows])
+            movable = [row for row in rows if row.pk not in referenced]
+
+            if movable and not purge:
+                ArchivedRecord.objects.bulk_create(
+                    [
+                        ArchivedRecord(
+                            model_label=label,
+                            object_id=str(item["pk"]),
+                            tenant_id=getattr(row, "tenant_id", None),
+                            data=item["fields"],
+                            deleted_at=row.deleted_at,
+                            deleted_by=row.deleted_by,
+                        )
+                        for row, item in zip(
+                            movable, serializers.serialize("python", movable)
+                        )
+                    ]
+                )
+
+            if movable:
+                model._base_manager.filter(pk__in=[row.pk for row in movable]).delete()
+
+        processed += len(movable)
+        if referenced:
+            logger.info(
+                f"[ARCHIVE] Skipped {len(referenced)} rows of {label} "
+                "still referenced by other rows"
+            )
+
+        last_pk = rows[-1].pk
+        logger.info(
+            f"[ARCHIVE] {'Purged' if purge else 'Archived'} {processed} rows of {label}"
+        )
+
+        if len(rows) < batch_size:
+            break
+        if sleep:
+            time.sleep(sleep)
+
+    return processed
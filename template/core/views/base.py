@@ -0,0 +1,320 @@
+import base64
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.core.exceptions import ValidationError as DjangoValidationError
+from django.db.models import Q
+from django.utils import timezone
+from django.utils.dateparse import parse_datetime
+from middlewares.tenantaware import get_current_tenant_id
+from rest_framework import serializers
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import SAFE_METHODS
+from rest_framework.response import Response
+from rest_framework.viewsets import ModelViewSet
+
+from core.exceptions import SyncTokenExpired
+
+
+def encode_sync_token(synced_at, modified_at=None, pk=None):
+    """
+    Encode a sync cursor and the time the client is synced up to as an opaque
+    token.
+
+    The cursor is the (modified_at, pk) of the last synced row, or empty when
+    nothing has been synced yet.
+    """
+    raw = json.dumps(
+        [
+            synced_at.isoformat(),
+            modified_at.isoformat() if modified_at else None,
+            str(pk) if pk is not None else None,
+        ]
+    )
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _parse_aware_datetime(value):
+    parsed = parse_datetime(value)
+    if parsed is None or timezone.is_naive(parsed):
+        raise ValueError(f"Invalid timestamp: {value}")
+    return parsed
+
+
+def decode_sync_token(token, model):
+    """
+    Decode a token produced by encode_sync_token.
+
+    Returns:
+        tuple: (synced_at, modified_at, pk); modified_at and pk are None for an
+            empty cursor
+
+    Raises:
+        ValidationError: If the token is malformed
+    """
+    try:
+        synced_at, modified_at, pk = json.loads(
+            base64.urlsafe_b64decode(token.encode())
+        )
+        synced_at = _parse_aware_datetime(synced_at)
+        if modified_at is not None:
+            modified_at = _parse_aware_datetime(modified_at)
+            if pk is None:
+                raise ValueError("Missing pk")
+            pk = model._meta.pk.to_python(pk)
+    except (ValueError, TypeError, DjangoValidationError):
+        raise ValidationError({"since": ["Invalid sync token."]})
+
+    return synced_at, modified_at, pk
+
+
+class SparseFieldsetMixin:
+    """
+    Adds `?fields=a,b` and `?omit=c` query parameters to read actions.
+
+    The serializer is trimmed to the selected fields and the queryset is
+    narrowed with only(), so unused columns are neither read from the database
+    nor serialized. Requires a serializer based on BaseModelSerializer.
+    """
+
+    # Fields a client may select (None: every serializer field)
+    sparse_fields = None
+    # Fields returned when ?fields= is not given (None: every allowed field)
+    default_sparse_fields = None
+
+    def _parse_fields_param(self, name):
+        value = self.request.query_params.get(name, "")
+        return [field.strip() for field in value.split(",") if field.strip()]
+
+    def get_sparse_fieldset(self):
+        """
+        Resolve the fields selected for this request.
+
+        Returns:
+            list: Selected serializer field names, or None to keep every field
+
+        Raises:
+            ValidationError: If an unknown or disallowed field is requested
+        """
+        if hasattr(self, "_sparse_fieldset"):
+            return self._sparse_fieldset
+
+        self._sparse_fieldset = None
+        if (
+            getattr(self, "swagger_fake_view", False)
+            or self.request is None
+            or self.request.method not in SAFE_METHODS
+        ):
+            return None
+
+        serializer = self.get_serializer_class()(context=self.get_serializer_context())
+        available = list(serializer.fields)
+        allowed = available if self.sparse_fields is None else list(self.sparse_fields)
+
+        requested = self._parse_fields_param("fields")
+        omitted = self._parse_fields_param("omit")
+        for param, names in (("fields", requested), ("omit", omitted)):
+            unknown = [name for name in names if name not in allowed]
+            if unknown:
+                raise ValidationError(
+                    {param: [f"Unknown field(s): {', '.join(unknown)}."]}
+                )
+
+        if requested:
+            selected = set(requested)
+        elif self.default_sparse_fields is not None:
+            selected = set(self.default_sparse_fields)
+        else:
+            selected = set(allowed)
+        selected -= set(omitted)
+
+        # Rows must stay identifiable (e.g. in the changes action), keep the pk
+        pk_sources = {"pk", serializer.Meta.model._meta.pk.name}
+        selected |= {
+            name for name in available if serializer.fields[name].source in pk_sources
+        }
+
+        if selected != set(available):
+            # Keep the serializer's field order
+            self._sparse_fieldset = [name for name in available if name in selected]
+            self._sparse_columns = self._get_sparse_columns(
+                serializer, self._sparse_fieldset
+            )
+
+        return self._sparse_fieldset
+
+    def _get_sparse_columns(self, serializer, fields):
+        """Map serializer fields to model fields, or None if one cannot be mapped."""
+        opts = serializer.Meta.model._meta
+        columns = {opts.pk.name}
+
+        for name in fields:
+            source = serializer.fields[name].source
+            try:
+                model_field = opts.get_field(source)
+            except FieldDoesNotExist:
+                # Method fields, properties and nested sources may read anything
+                return None
+            if model_field.many_to_many or model_field.one_to_many:
+                continue
+            if not model_field.concrete:
+                return None
+            columns.add(model_field.name)
+
+        return columns
+
+    def get_required_columns(self):
+        """Model fields loaded regardless of the selected fieldset."""
+        return set()
+
+    def get_serializer(self, *args, **kwargs):
+        fields = self.get_sparse_fieldset()
+        if fields is not None:
+            kwargs.setdefault("fields", fields)
+        return super().get_serializer(*args, **kwargs)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+        if self.get_sparse_fieldset() is not None and self._sparse_columns:
+            queryset = queryset.only(
+                *(self._sparse_columns | self.get_required_columns())
+            )
+        return queryset
+
+
+class SyncMixin:
+    """
+    Adds a `changes` list action for incremental sync of BaseModel rows.
+
+    GET <prefix>/changes/?since=<token>&limit=<n> returns rows created, updated
+    or soft-deleted after the token, ordered by (modified_at, id). Soft-deleted
+    rows are returned as tombstones. Pass the returned sync_token on the next
+    call, and keep calling while has_more is true.
+
+    In the changes action get_queryset() starts from get_changes_queryset(), so
+    subclasses that narrow super().get_queryset() scope the synced rows and
+    tombstones the same way.
+    """
+
+    sync_page_size = 100
+    sync_max_page_size = 1000
+
+    def get_queryset(self):
+        if self.action == "changes":
+            return self.get_changes_queryset()
+        return super().get_queryset()
+
+    def get_changes_queryset(self):
+        """
+        Queryset for the changes action, including soft-deleted rows.
+
+        Rows are scoped to the current tenant for models with a tenant_id.
+        """
+        manager = self.queryset.model._default_manager
+        if hasattr(manager, "all_with_deleted"):
+            queryset = manager.all_with_deleted()
+        else:
+            queryset = manager.all()
+
+        tenant_id = get_current_tenant_id()
+        if tenant_id:
+            try:
+                queryset.model._meta.get_field("tenant_id")
+            except FieldDoesNotExist:
+                pass
+            else:
+                queryset = queryset.filter(tenant_id=tenant_id)
+        return queryset
+
+    def get_required_columns(self):
+        # Used by SparseFieldsetMixin: tombstones and tokens read these columns
+        columns = super().get_required_columns()
+        if self.action == "changes":
+            columns |= {"modified_at", "is_deleted", "deleted_at"}
+        return columns
+
+    def get_tombstone(self, obj):
+        """Minimal representation of a soft-deleted row."""
+        timestamp = serializers.DateTimeField()
+        return {
+            "id": str(obj.pk),
+            "is_deleted": True,
+            "deleted_at": timestamp.to_representation(obj.deleted_at),
+            "modified_at": timestamp.to_representation(obj.modified_at),
+        }
+
+    def _get_sync_limit(self, request):
+        limit = request.query_params.get("limit")
+        if limit is None:
+            return self.sync_page_size
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValidationError({"limit": ["A valid integer is required."]})
+        return max(1, min(limit, self.sync_max_page_size))
+
+    def _check_token_age(self, model, synced_at):
+        """Reject tokens synced up to before the window tombstones are kept in."""
+        if not getattr(model, "archive_mode", None):
+            return
+
+        retention_days = model.archive_retention_days
+        if retention_days is None:
+            retention_days = getattr(settings, "SOFT_DELETE_RETENTION_DAYS", 30)
+
+        if synced_at < timezone.now() - timedelta(days=retention_days):
+            raise SyncTokenExpired()
+
+    @action(detail=False, methods=["get"])
+    def changes(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        token = request.query_params.get("since")
+        synced_at, since, last_pk = None, None, None
+
+        if token:
+            synced_at, since, last_pk = decode_sync_token(token, queryset.model)
+            self._check_token_age(queryset.model, synced_at)
+            if since is not None:
+                queryset = queryset.filter(
+                    Q(modified_at__gt=since) | Q(modified_at=since, pk__gt=last_pk)
+                )
+
+        limit = self._get_sync_limit(request)
+        rows = list(queryset.order_by("modified_at", "pk")[: limit + 1])
+        has_more = len(rows) > limit
+        rows = rows[:limit]
+
+        live = iter(
+            self.get_serializer(
+                [obj for obj in rows if not obj.is_deleted], many=True
+            ).data
+        )
+        results = [
+            self.get_tombstone(obj) if obj.is_deleted else next(live) for obj in rows
+        ]
+
+        if rows:
+            since, last_pk = rows[-1].modified_at, rows[-1].pk
+
+        now = timezone.now()
+        if has_more:
+            # Rows past the cursor are not synced yet: keep the point the
+            # client's data dates from, or the cursor if it is later
+            synced_at = max(synced_at or now, since)
+        else:
+            synced_at = now
+
+        return Response(
+            {
+                "results": results,
+                "sync_token": encode_sync_token(synced_at, since, last_pk),
+                "has_more": has_more,
+            }
+        )
+
+
+class BaseModelViewSet(SyncMixin, SparseFieldsetMixin, ModelViewSet):
+    """ModelViewSet for BaseModel subclasses"""
@@ -0,0 +1,10 @@
+from celery import shared_task
+
+
+@shared_task(ignore_result=True)
+def archive_soft_deleted_rows():
+    """Archive or purge expired soft-deleted rows of every archivable model."""
+    from core.utils.archive import archive_soft_deleted, get_archivable_models
+
+    for model in get_archivable_models():
+        archive_soft_deleted(model)
@@ -0,0 +1,198 @@
+import logging
+import uuid
+from collections import deque
+
+from celery import Task
+from celery._state import get_current_worker_task
+from django.conf import settings
+from middlewares.tenantaware import (
+    _clear_thread_locals,
+    _set_thread_locals,
+    get_current_tenant,
+    get_current_tenant_id,
+    get_current_user,
+    get_request_id,
+)
+
+logger = logging.getLogger(__name__)
+
+# Message header used to carry the dispatcher's context to the worker
+CONTEXT_HEADER = "tenant_context"
+
+
+def capture_context():
+    """Snapshot the current thread-local context as a JSON-serializable dict."""
+    tenant_id = get_current_tenant_id()
+    request_id = get_request_id()
+
+    return {
+        "tenant": get_current_tenant(),
+        "user": get_current_user(),
+        "tenant_id": str(tenant_id) if tenant_id else None,
+        "request_id": str(request_id) if request_id else None,
+    }
+
+
+def restore_context(context):
+    """Replace the current thread-local context with a captured snapshot."""
+    _clear_thread_locals()
+
+    if not context:
+        return
+
+    request_id = context.get("request_id")
+    _set_thread_locals(
+        tenant=context.get("tenant"),
+        user=context.get("user"),
+        tenant_id=context.get("tenant_id"),
+        request_id=uuid.UUID(request_id) if request_id else None,
+    )
+
+
+class TenantAwareTask(Task):
+    """
+    Base task that carries tenant, user and request ID from dispatch to worker.
+
+    The context is captured in apply_async() and sent as a message header, then
+    restored into thread-local storage around the task body so BaseModel.save()
+    and TenantAwareManager behave exactly as they do inside a request.
+    """
+
+    def apply_async(self, args=None, kwargs=None, **options):
+        headers = dict(options.pop("headers", None) or {})
+        headers.setdefault(CONTEXT_HEADER, capture_context())
+        return super().apply_async(args, kwargs, headers=headers, **options)
+
+    def __call__(self, *args, **kwargs):
+        context = self._get_dispatch_context()
+
+        # Direct calls (my_task(...)) keep running in the caller's context
+        if context is None:
+            return super().__call__(*args, **kwargs)
+
+        # Eager tasks run in the caller's thread, so put its context back after
+        previous = capture_context()
+        restore_context(context)
+        try:
+            return super().__call__(*args, **kwargs)
+        finally:
+            restore_context(previous)
+
+    def _get_dispatch_context(self):
+        """Read the captured context from the current task request."""
+        context = getattr(self.request, CONTEXT_HEADER, None)
+        if context is None:
+            context = (self.request.headers or {}).get(CONTEXT_HEADER)
+        return context
+
+    @staticmethod
+    def get_chunk(queryset, lower_pk, upper_pk):
+        """
+        Return the rows of a queryset that belong to a chunk sent by fan_out().
+
+        Args:
+            queryset: Queryset to narrow down (re-evaluated in the worker)
+            lower_pk: Exclusive lower bound, None for the first chunk
+            upper_pk: Inclusive upper bound
+        """
+        if lower_pk is not None:
+            queryset = queryset.filter(pk__gt=lower_pk)
+        return queryset.filter(pk__lte=upper_pk).order_by("pk")
+
+
+def _json_pk(pk):
+    return str(pk) if isinstance(pk, uuid.UUID) else pk
+
+
+def iter_pk_ranges(queryset, chunk_size):
+    """
+    Split a queryset into consecutive primary-key ranges of chunk_size rows.
+
+    Yields (lower_pk, upper_pk) tuples where lower_pk is exclusive (None for the
+    first range) and upper_pk is inclusive. Only primary keys are read, walking
+    the index one boundary at a time instead of loading every row.
+    """
+    pks = queryset.order_by("pk").values_list("pk", flat=True)
+    lower = None
+
+    while True:
+        window = pks if lower is None else pks.filter(pk__gt=lower)
+        boundary = list(window[chunk_size - 1 : chunk_size])
+        upper = boundary[0] if boundary else window.last()
+
+        if upper is None:
+            return
+
+        yield _json_pk(lower) if lower is not None else None, _json_pk(upper)
+
+        if not boundary:
+            return
+        lower = upper
+
+
+def fan_out(
+    task,
+    queryset,
+    args=(),
+    kwargs=None,
+    chunk_size=None,
+    max_in_flight=None,
+    countdown_step=None,
+    **options,
+):
+    """
+    Dispatch one task per primary-key range of a queryset.
+
+    The task is called as task(lower_pk, upper_pk, *args, **kwargs) and should
+    use TenantAwareTask.get_chunk() to load its rows.
+
+    Args:
+        task: Task to dispatch
+        queryset: Queryset to split into chunks
+        args: Extra positional arguments for every chunk
+        kwargs: Extra keyword arguments for every chunk
+        chunk_size: Rows per chunk (default: CELERY_FANOUT_CHUNK_SIZE)
+        max_in_flight: Wait for the oldest chunk before sending more than this
+            many at once; requires a result backend (default:
+            CELERY_FANOUT_MAX_IN_FLIGHT, 0 disables). Ignored when called from
+            inside a worker, where waiting would hold a worker slot; use
+            countdown_step there instead
+        countdown_step: Seconds to delay each chunk after the previous one
+        **options: Extra options passed to apply_async (queue, priority, ...)
+
+    Returns:
+        list: AsyncResult for every dispatched chunk
+    """
+    if chunk_size is None:
+        chunk_size = getattr(settings, "CELERY_FANOUT_CHUNK_SIZE", 500)
+    if max_in_flight is None:
+        max_in_flight = getattr(settings, "CELERY_FANOUT_MAX_IN_FLIGHT", 0)
+
+    if chunk_size < 1:
+        raise ValueError("chunk_size must be at least 1")
+
+    if max_in_flight and get_current_worker_task() is not None:
+        logger.warning(
+            f"[FANOUT] Ignoring max_in_flight for {task.name}: "
+            "cannot wait for results inside a worker"
+        )
+        max_in_flight = 0
+
+    results = []
+    in_flight = deque()
+
+    for index, (lower_pk, upper_pk) in enumerate(iter_pk_ranges(queryset, chunk_size)):
+        if max_in_flight and len(in_flight) >= max_in_flight:
+            in_flight.popleft().get(propagate=False, disable_sync_subtasks=False)
+
+        if countdown_step:
+            options["countdown"] = index * countdown_step
+
+        result = task.apply_async(
+            args=(lower_pk, upper_pk, *args), kwargs=kwargs, **options
+        )
+        results.append(result)
+        in_flight.append(result)
+
+    logger.info(f"[FANOUT] Dispatched {len(results)} chunks of {task.name}")
+    return results
@@ -0,0 +1,151 @@
+from unittest import mock
+
+from celery import shared_task
+from celery.result import EagerResult
+from django.contrib.auth.models import Group
+from django.test import TestCase
+from middlewares.tenantaware import (
+    _clear_thread_locals,
+    _set_thread_locals,
+    get_current_tenant_id,
+    get_current_user,
+)
+
+from config.celery import app
+from core.tasks.base import TenantAwareTask, fan_out, iter_pk_ranges
+
+USER = {"user_id": "6d1f4d0e-0f3c-4b8e-9e0c-1c1e1e1e1e1e", "tenant_id": "t1"}
+
+
+@shared_task
+def current_context():
+    return {"tenant_id": get_current_tenant_id(), "user": get_current_user()}
+
+
+@shared_task(bind=True)
+def collect_chunk(self, lower_pk, upper_pk):
+    return list(
+        self.get_chunk(Group.objects.all(), lower_pk, upper_pk).values_list(
+            "name", flat=True
+        )
+    )
+
+
+class EagerTaskTestCase(TestCase):
+    def setUp(self):
+        # Settings are namespaced, so override the CELERY_ keys Celery reads.
+        # Eager tasks still open a producer and a result backend, so keep both
+        # in memory.
+        self._conf = {
+            "CELERY_TASK_ALWAYS_EAGER": app.conf.task_always_eager,
+            "CELERY_BROKER_URL": app.conf.broker_url,
+            "CELERY_RESULT_BACKEND": app.conf.result_backend,
+        }
+        app.conf.update(
+            CELERY_TASK_ALWAYS_EAGER=True,
+            CELERY_BROKER_URL="memory://",
+            CELERY_RESULT_BACKEND="cache+memory://",
+        )
+        _set_thread_locals(tenant=USER, user=USER, tenant_id="t1")
+
+    def tearDown(self):
+        app.conf.update(**self._conf)
+        _clear_thread_locals()
+
+
+class TenantAwareTaskTests(EagerTaskTestCase):
+    def test_tasks_use_tenant_aware_base(self):
+        self.assertIsInstance(current_context, TenantAwareTask)
+
+    def test_context_is_restored_in_task(self):
+        result = current_context.delay().get()
+
+        self.assertEqual(result, {"tenant_id": "t1", "user": USER})
+
+    def test_context_captured_at_dispatch(self):
+        _clear_thread_locals()
+
+        result = current_context.delay().get()
+
+        self.assertEqual(result, {"tenant_id": None, "user": None})
+
+    def test_caller_context_is_kept_after_eager_task(self):
+        current_context.delay().get()
+
+        self.assertEqual(get_current_tenant_id(), "t1")
+        self.assertEqual(get_current_user(), USER)
+
+    def test_direct_call_keeps_caller_context(self):
+        self.assertEqual(current_context(), {"tenant_id": "t1", "user": USER})
+        self.assertEqual(get_current_tenant_id(), "t1")
+
+
+class IterPkRangesTests(TestCase):
+    def create_groups(self, count):
+        groups = [Group.objects.create(name=f"group-{i}") for i in range(count)]
+        return sorted(group.pk for group in groups)
+
+    def test_empty_queryset(self):
+        self.assertEqual(list(iter_pk_ranges(Group.objects.all(), 3)), [])
+
+    def test_partial_last_range(self):
+        pks = self.create_groups(7)
+
+        ranges = list(iter_pk_ranges(Group.objects.all(), 3))
+
+        self.assertEqual(ranges, [(None, pks[2]), (pks[2], pks[5]), (pks[5], pks[6])])
+
+    def test_exact_multiple_of_chunk_size(self):
+        pks = self.create_groups(6)
+
+        ranges = list(iter_pk_ranges(Group.objects.all(), 3))
+
+        self.assertEqual(ranges, [(None, pks[2]), (pks[2], pks[5])])
+
+    def test_respects_queryset_filter(self):
+        pks = self.create_groups(5)
+
+        ranges = list(iter_pk_ranges(Group.objects.filter(pk__gt=pks[1]), 2))
+
+        self.assertEqual(ranges, [(None, pks[3]), (pks[3], pks[4])])
+
+
+class FanOutTests(EagerTaskTestCase):
+    def test_every_row_is_dispatched_once(self):
+        names = {f"group-{i}" for i in range(7)}
+        for name in names:
+            Group.objects.create(name=name)
+
+        results = fan_out(collect_chunk, Group.objects.all(), chunk_size=3)
+
+        chunks = [result.get() for result in results]
+        self.assertEqual([len(chunk) for chunk in chunks], [3, 3, 1])
+        self.assertEqual(set().union(*chunks), names)
+
+    def test_max_in_flight_waits_for_oldest_chunk(self):
+        for i in range(5):
+            Group.objects.create(name=f"group-{i}")
+
+        with mock.patch.object(
+            EagerResult, "get", autospec=True, side_effect=EagerResult.get
+        ) as get:
+            results = fan_out(
+                collect_chunk, Group.objects.all(), chunk_size=1, max_in_flight=2
+            )
+
+        # Chunks 3, 4 and 5 each wait for the oldest of the two in flight
+        self.assertEqual(len(results), 5)
+        self.assertEqual([call.args[0] for call in get.call_args_list], results[:3])
+
+    def test_no_waiting_without_max_in_flight(self):
+        for i in range(5):
+            Group.objects.create(name=f"group-{i}")
+
+        with mock.patch.object(EagerResult, "get", autospec=True) as get:
+            fan_out(collect_chunk, Group.objects.all(), chunk_size=1, max_in_flight=0)
+
+        get.assert_not_called()
+
+    def test_invalid_chunk_size(self):
+        with self.assertRaises(ValueError):
+            fan_out(collect_chunk, Group.objects.all(), chunk_size=0)